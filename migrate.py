@@ -7,36 +7,207 @@ DuckyTheDuck 地图存档迁移工具 - GUI 版本
 
 import sys
 import shutil
+import functools
 import os
+import re
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QListWidget, QListWidgetItem, QPushButton, QMessageBox,
-    QCheckBox, QGroupBox
+    QLabel, QListView, QListWidget, QListWidgetItem, QPushButton, QMessageBox,
+    QGroupBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QCloseEvent, QColor, QFont
 from sc2bank import sc2bank  # type: ignore
 
 # 配置常量
 OLD_PUBLISHER_ID: str = "5-S2-1-11831282"
 NEW_PUBLISHER_ID: str = "5-S2-1-10786818"
 
-BANK_FILES: list[str] = [
-    "CrashRPGMaximumBank.SC2Bank",
-    "HSF.SC2Bank",
-    "PBRPG.SC2Bank",
-    "CDRPGBank.SC2Bank",
-    "NeoStarBank.SC2Bank",
-]
+# 国服账号句柄文件夹的前缀
+_CN_HANDLE_PREFIX: str = "5-S2-1"
 
-BANK_NAMES: dict[str, str] = {
-    "CrashRPGMaximumBank.SC2Bank": "紧急迫降 RPG",
-    "HSF.SC2Bank": "地狱特种部队",
-    "PBRPG.SC2Bank": "破灵者 RPG",
-    "CDRPGBank.SC2Bank": "十死无生 RPG",
-    "NeoStarBank.SC2Bank": "新星防卫 RPG",
-}
+# 存档列表项中标记 "目标位置已有存档" 的数据角色
+EXISTING_ROLE: int = Qt.ItemDataRole.UserRole.value + 1
+
+# (存档文件名, 地图名称)，顺序即界面中的显示顺序
+BANKS: tuple[tuple[str, str], ...] = (
+    ("CrashRPGMaximumBank.SC2Bank", "紧急迫降 RPG"),
+    ("HSF.SC2Bank", "地狱特种部队"),
+    ("PBRPG.SC2Bank", "破灵者 RPG"),
+    ("CDRPGBank.SC2Bank", "十死无生 RPG"),
+    ("NeoStarBank.SC2Bank", "新星防卫 RPG"),
+)
+
+BANK_FILES: tuple[str, ...] = tuple(bank_file for bank_file, _ in BANKS)
+
+# NTFS 文件名不区分大小写，与目录中的文件名比较时统一使用 os.path.normcase
+_BANK_FILES_SET: frozenset[str] = frozenset(os.path.normcase(bank_file) for bank_file in BANK_FILES)
+
+# 首次复制时确定的复制函数，见 _get_copy_function
+_copy_function: Callable[[str, str], object] | None = None
+_copy_function_lock = threading.Lock()
+
+
+def _resolve_copy_function() -> Callable[[str, str], object]:
+    """选择复制文件的实现，Windows 上确保使用系统的 CopyFile2"""
+    if sys.platform == "win32":
+        import _winapi
+        if not hasattr(_winapi, "CopyFile2"):
+            # 旧版本 Python 的 shutil.copy2 不会调用 CopyFile2，通过 ctypes 直接调用
+            import ctypes
+            copy_file2 = ctypes.WinDLL("kernel32").CopyFile2  # type: ignore
+            copy_file2.argtypes = [ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_void_p]
+            copy_file2.restype = ctypes.HRESULT  # 返回失败的 HRESULT 时自动抛出 OSError
+            
+            def copy_with_copy_file2(src: str, dst: str) -> None:
+                copy_file2(src, dst, None)
+                shutil.copystat(src, dst)
+            
+            return copy_with_copy_file2
+    return shutil.copy2
+
+
+def _get_copy_function() -> Callable[[str, str], object]:
+    global _copy_function
+    if _copy_function is None:
+        with _copy_function_lock:
+            if _copy_function is None:
+                _copy_function = _resolve_copy_function()
+    return _copy_function
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """复制文件并保留元数据，Windows 上交由系统的 CopyFile2 完成"""
+    _ = _get_copy_function()(src, dst)
+
+
+# FSCTL_DUPLICATE_EXTENTS_TO_FILE，ReFS 的块克隆控制码
+_FSCTL_DUPLICATE_EXTENTS_TO_FILE: int = 0x00098344
+
+
+# 块克隆用到的 kernel32 实例和 DUPLICATE_EXTENTS_DATA 结构体，首次使用时加载，见 _get_clone_api
+_clone_api: tuple[Any, Any] | None = None
+_clone_api_lock = threading.Lock()
+
+
+def _load_clone_api() -> tuple[Any, Any]:
+    import ctypes
+    from ctypes import wintypes
+    
+    class DuplicateExtentsData(ctypes.Structure):
+        _fields_ = [
+            ("FileHandle", wintypes.HANDLE),
+            ("SourceFileOffset", ctypes.c_longlong),
+            ("TargetFileOffset", ctypes.c_longlong),
+            ("ByteCount", ctypes.c_longlong),
+        ]
+    
+    # 使用独立的 WinDLL 实例，设置函数原型不会影响进程中其他使用 kernel32 的代码
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore
+    kernel32.GetVolumePathNameW.argtypes = [wintypes.LPCWSTR, wintypes.LPWSTR, wintypes.DWORD]
+    kernel32.GetVolumePathNameW.restype = wintypes.BOOL
+    kernel32.GetVolumeInformationW.argtypes = [
+        wintypes.LPCWSTR, wintypes.LPWSTR, wintypes.DWORD, wintypes.LPDWORD,
+        wintypes.LPDWORD, wintypes.LPDWORD, wintypes.LPWSTR, wintypes.DWORD,
+    ]
+    kernel32.GetVolumeInformationW.restype = wintypes.BOOL
+    kernel32.GetDiskFreeSpaceW.argtypes = [
+        wintypes.LPCWSTR, wintypes.LPDWORD, wintypes.LPDWORD, wintypes.LPDWORD, wintypes.LPDWORD,
+    ]
+    kernel32.GetDiskFreeSpaceW.restype = wintypes.BOOL
+    kernel32.DeviceIoControl.argtypes = [
+        wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID, wintypes.DWORD,
+        wintypes.LPVOID, wintypes.DWORD, wintypes.LPDWORD, wintypes.LPVOID,
+    ]
+    kernel32.DeviceIoControl.restype = wintypes.BOOL
+    return kernel32, DuplicateExtentsData
+
+
+def _get_clone_api() -> tuple[Any, Any]:
+    global _clone_api
+    if _clone_api is None:
+        with _clone_api_lock:
+            if _clone_api is None:
+                _clone_api = _load_clone_api()
+    return _clone_api
+
+
+@functools.lru_cache(maxsize=None)
+def _volume_of_dir(dirname: str) -> tuple[str, str, int]:
+    """返回目录所在卷的 (根目录, 文件系统名称, 簇大小)，每个目录只查询一次"""
+    import ctypes
+    kernel32, _ = _get_clone_api()
+    root = ctypes.create_unicode_buffer(261)
+    if not kernel32.GetVolumePathNameW(dirname, root, len(root)):
+        raise ctypes.WinError(ctypes.get_last_error())  # type: ignore
+    fs_name = ctypes.create_unicode_buffer(261)
+    if not kernel32.GetVolumeInformationW(root.value, None, 0, None, None, None, fs_name, len(fs_name)):
+        raise ctypes.WinError(ctypes.get_last_error())  # type: ignore
+    sectors_per_cluster = ctypes.c_ulong()
+    bytes_per_sector = ctypes.c_ulong()
+    if not kernel32.GetDiskFreeSpaceW(root.value, ctypes.byref(sectors_per_cluster),
+                                      ctypes.byref(bytes_per_sector), None, None):
+        raise ctypes.WinError(ctypes.get_last_error())  # type: ignore
+    return root.value, fs_name.value, sectors_per_cluster.value * bytes_per_sector.value
+
+
+def _clone_file(src: str, dst: str, cluster_size: int) -> None:
+    """通过 ReFS 块克隆复制文件，目标与源共享数据块，写入时才分离"""
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+    kernel32, DuplicateExtentsData = _get_clone_api()
+    
+    size = os.path.getsize(src)
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        # 克隆区域必须按簇对齐，先把目标文件扩展到源文件大小
+        _ = fdst.truncate(size)
+        if size:
+            data = DuplicateExtentsData(
+                msvcrt.get_osfhandle(fsrc.fileno()), 0, 0,  # type: ignore
+                -(-size // cluster_size) * cluster_size,
+            )
+            returned = wintypes.DWORD()
+            if not kernel32.DeviceIoControl(msvcrt.get_osfhandle(fdst.fileno()),  # type: ignore
+                                            _FSCTL_DUPLICATE_EXTENTS_TO_FILE,
+                                            ctypes.byref(data), ctypes.sizeof(data),
+                                            None, 0, ctypes.byref(returned), None):
+                raise ctypes.WinError(ctypes.get_last_error())  # type: ignore
+    shutil.copystat(src, dst)
+
+
+def _clone_or_copy(src: str, dst: str) -> None:
+    """源和目标位于同一 ReFS 卷（如 Dev Drive）时使用块克隆，否则回退到普通复制"""
+    if sys.platform == "win32":
+        try:
+            src_root, fs_name, cluster_size = _volume_of_dir(os.path.dirname(os.path.abspath(src)))
+            dst_root, _, _ = _volume_of_dir(os.path.dirname(os.path.abspath(dst)))
+            if src_root == dst_root and fs_name == "ReFS":
+                _clone_file(src, dst, cluster_size)
+                return
+        except OSError:
+            pass  # 块克隆不可用时回退到普通复制
+    _fast_copy(src, dst)
+
+
+def _next_backup_path(file_path: str) -> str:
+    """在已有备份 (file.bak1, file.bak2, ...) 的最大编号之后取下一个备份路径"""
+    parent, name = os.path.split(file_path)
+    pattern = re.compile(rf"{re.escape(name)}\.bak(\d+)$")
+    with os.scandir(parent) as it:
+        max_num = max((int(m.group(1)) for entry in it if (m := pattern.match(entry.name))), default=0)
+    return os.path.join(parent, f"{name}.bak{max_num + 1}")
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_bank(content: str) -> tuple[list, str | None]:
+    """解析存档内容，内容相同时（如重复迁移或重试）直接复用上次的解析结果"""
+    return sc2bank.parse_string(content)
 
 
 class Account:
@@ -46,39 +217,56 @@ class Account:
         self.path: Path = account_path
         self.battle_net_id: str = battle_net_id
         self.handle: str = handle
-        self.old_bank_path: Path = account_path / "Banks" / OLD_PUBLISHER_ID
-        self.new_bank_path: Path = account_path / "Banks" / NEW_PUBLISHER_ID
+        # 迁移时直接使用字符串路径拼接，避免为每个文件构造 Path 对象
+        self.old_bank_dir: str = os.path.join(os.fspath(account_path), "Banks", OLD_PUBLISHER_ID)
+        self.new_bank_dir: str = os.path.join(os.fspath(account_path), "Banks", NEW_PUBLISHER_ID)
+        self._old_names_cache: frozenset[str] | None = None
+        self._migratable_cache: tuple[str, ...] | None = None
+        self._new_names_cache: frozenset[str] | None = None
     
-    def has_old_banks(self) -> bool:
-        if not self.old_bank_path.exists():
-            return False
-        for bank_file in BANK_FILES:
-            if (self.old_bank_path / bank_file).exists():
-                return True
-        return False
-    
-    def get_migratable_files(self) -> list[str]:
-        files = []
-        if not self.old_bank_path.exists():
-            return files
-        for bank_file in BANK_FILES:
-            if (self.old_bank_path / bank_file).exists():
-                files.append(bank_file)
-        return files
+    @staticmethod
+    def _scan_dir(path: str) -> frozenset[str]:
+        """一次性读取目录中的文件名 (经 normcase 处理)，目录不存在或不是目录时返回空集合"""
+        try:
+            with os.scandir(path) as it:
+                return frozenset(os.path.normcase(entry.name) for entry in it)
+        except (FileNotFoundError, NotADirectoryError):
+            return frozenset()
+    
+    def _old_names(self) -> frozenset[str]:
+        if self._old_names_cache is None:
+            self._old_names_cache = self._scan_dir(self.old_bank_dir)
+        return self._old_names_cache
+    
+    def _new_names(self) -> frozenset[str]:
+        if self._new_names_cache is None:
+            self._new_names_cache = self._scan_dir(self.new_bank_dir)
+        return self._new_names_cache
+    
+    def invalidate_target_cache(self) -> None:
+        """目标文件夹内容发生变化后调用，下次查询时重新扫描"""
+        self._new_names_cache = None
+    
+    def record_target_files(self, files: frozenset[str]) -> None:
+        """记录刚写入目标文件夹的存档，已扫描过的结果无需重新扫描"""
+        if self._new_names_cache is not None:
+            self._new_names_cache |= frozenset(os.path.normcase(bank_file) for bank_file in files)
+    
+    def get_migratable_files(self) -> tuple[str, ...]:
+        # 旧存档文件夹在程序运行期间不会被修改，结果只计算一次
+        if self._migratable_cache is None:
+            found = self._old_names() & _BANK_FILES_SET
+            self._migratable_cache = tuple(bank_file for bank_file in BANK_FILES if os.path.normcase(bank_file) in found)
+        return self._migratable_cache
     
     def get_existing_target_files(self) -> list[str]:
-        files = []
-        if not self.new_bank_path.exists():
-            return files
-        for bank_file in BANK_FILES:
-            if (self.new_bank_path / bank_file).exists():
-                files.append(bank_file)
-        return files
+        found = self._new_names() & _BANK_FILES_SET
+        return [bank_file for bank_file in BANK_FILES if os.path.normcase(bank_file) in found]
 
 
 class MigrationWorker(QThread):
     """后台迁移线程"""
-    finished = pyqtSignal(bool, str)  # type: ignore
+    finished = pyqtSignal(bool, str, frozenset)  # type: ignore
     
     def __init__(self, account: Account, selected_files: list[str]) -> None:
         super().__init__()
@@ -88,73 +276,197 @@ class MigrationWorker(QThread):
     def run(self) -> None:
         try:
             # 确保目标文件夹存在
-            self.account.new_bank_path.mkdir(parents=True, exist_ok=True)
+            os.makedirs(self.account.new_bank_dir, exist_ok=True)
             
-            migrated_count = 0
+            migrated_files: set[str] = set()
+            skipped_count = 0
+            failed_count = 0
             backup_count = 0
             
-            for bank_file in self.selected_files:
-                source = self.account.old_bank_path / bank_file
-                target = self.account.new_bank_path / bank_file
-                
-                try:
-                    # 如果目标文件已存在，创建备份
-                    if target.exists():
-                        backup_num = 1
-                        while True:
-                            backup_path = target.parent / f"{target.name}.bak{backup_num}"
-                            if not backup_path.exists():
-                                _ = shutil.copy2(target, backup_path)
-                                backup_count += 1
-                                break
-                            backup_num += 1
-                    
-                    # 复制文件
-                    _ = shutil.copy2(source, target)
-                    migrated_count += 1
-                    
-                    # 重新生成签名
-                    _ = self.resign_bank_file(target, self.account.handle)
-                    
-                except Exception:
-                    pass  # 忽略单个文件的错误，继续处理下一个
+            # 每个存档的备份、复制和签名互不相关，并行处理以重叠文件 I/O
+            max_workers = max(1, min(8, len(self.selected_files)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(self._migrate_one, bank_file): bank_file for bank_file in self.selected_files}
+                for future in as_completed(futures):
+                    status, backed_up = future.result()
+                    if status == "migrated":
+                        migrated_files.add(futures[future])
+                    elif status == "skipped":
+                        skipped_count += 1
+                    else:
+                        failed_count += 1
+                    backup_count += backed_up
+            migrated_count = len(migrated_files)
             
             msg = f"迁移完成！\n成功迁移: {migrated_count} 个文件"
+            if skipped_count > 0:
+                msg += f"\n已是最新，跳过: {skipped_count} 个文件"
             if backup_count > 0:
                 msg += f"\n创建备份: {backup_count} 个文件"
             
-            self.finished.emit(True, msg)
+            if failed_count > 0:
+                # 失败的存档可能已经截断或部分写入了目标文件，重新扫描目标文件夹
+                self.account.invalidate_target_cache()
+            else:
+                self.account.record_target_files(frozenset(migrated_files))
+            existing = frozenset(self.account.get_existing_target_files())
+            self.finished.emit(True, msg, existing)
             
         except Exception as e:
-            self.finished.emit(False, f"迁移失败: {str(e)}")
+            self.account.invalidate_target_cache()
+            self.finished.emit(False, f"迁移失败: {str(e)}", frozenset())
     
-    def resign_bank_file(self, bank_file_path: Path, user_id: str) -> bool:
-        """重新生成签名"""
+    def _migrate_one(self, bank_file: str) -> tuple[str, bool]:
+        """迁移单个存档，返回 (结果, 是否创建了备份)，结果为 migrated、skipped 或 failed"""
+        source = os.path.join(self.account.old_bank_dir, bank_file)
+        target = os.path.join(self.account.new_bank_dir, bank_file)
+        backed_up = False
+        
+        try:
+            # 只 stat 一次目标文件，后续的判断都复用这个结果
+            try:
+                target_stat: os.stat_result | None = os.stat(target, follow_symlinks=False)
+            except FileNotFoundError:
+                target_stat = None
+            
+            # 源存档和目标存档自上次迁移后都没有变化，无需重复迁移
+            if target_stat is not None and self._is_up_to_date(source, target, target_stat):
+                return "skipped", backed_up
+            
+            # 如果目标文件已存在，创建备份
+            if target_stat is not None:
+                _clone_or_copy(target, _next_backup_path(target))
+                backed_up = True
+            
+            # 复制文件并重新生成签名
+            bank_name = os.path.splitext(bank_file)[0]
+            if self._migrate_one_fused(source, target, bank_name, self.account.handle):
+                self._write_marker(source, target)
+            
+            return "migrated", backed_up
+        except Exception:
+            return "failed", backed_up  # 忽略单个文件的错误，继续处理下一个
+    
+    @staticmethod
+    def _marker_path(target: str) -> str:
+        """记录上次迁移状态的标记文件"""
+        return target + ".migrated"
+    
+    def _migration_stamp(self, source_stat: os.stat_result, target_stat: os.stat_result) -> str:
+        return (f"{source_stat.st_size}:{source_stat.st_mtime_ns}:"
+                f"{target_stat.st_size}:{target_stat.st_mtime_ns}:{self.account.handle}")
+    
+    def _is_up_to_date(self, source: str, target: str, target_stat: os.stat_result) -> bool:
+        try:
+            with open(self._marker_path(target), 'r', encoding='utf-8') as f:
+                marker = f.read()
+            return marker == self._migration_stamp(os.stat(source), target_stat)
+        except OSError:
+            return False
+    
+    def _write_marker(self, source: str, target: str) -> None:
+        try:
+            stamp = self._migration_stamp(os.stat(source), os.stat(target))
+            with open(self._marker_path(target), 'w', encoding='utf-8') as f:
+                _ = f.write(stamp)
+        except OSError:
+            pass  # 标记文件只用于跳过重复迁移，写入失败不影响结果
+    
+    def _migrate_one_fused(self, source: str, target: str, bank_name: str, user_id: str) -> bool:
+        """读取源存档，在内存中重新签名后一次性写入目标，返回是否成功签名"""
+        try:
+            # newline='' 保留源文件原有的换行符
+            with open(source, 'r', encoding='utf-8', newline='') as f:
+                content: str | None = f.read()
+        except UnicodeDecodeError:
+            content = None
+        
+        new_content = self.resign_content(content, bank_name, user_id) if content is not None else None
+        if new_content is None:
+            # 无法重新签名的存档按字节原样复制
+            _clone_or_copy(source, target)
+            return False
+        
+        with open(target, 'w', encoding='utf-8', newline='') as f:
+            _ = f.write(new_content)
+        
+        # 与 shutil.copy2 一样保留源文件的时间戳
+        source_stat = os.stat(source)
+        os.utime(target, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        return True
+    
+    def resign_content(self, content: str, bank_name: str, user_id: str) -> str | None:
+        """重新生成签名，返回替换签名后的存档内容，失败时返回 None"""
         try:
             author_id = NEW_PUBLISHER_ID
-            bank_name = bank_file_path.stem
             
-            bank, old_signature = sc2bank.parse(str(bank_file_path))
+            bank, old_signature = _parse_bank(content)
             new_signature = sc2bank.sign(author_id, user_id, bank_name, bank)
             
-            with open(bank_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             if old_signature and old_signature in content:
-                new_content = content.replace(old_signature, new_signature)
+                return content.replace(old_signature, new_signature)
             else:
                 if '</Bank>' in content:
-                    signature_tag = f'    <Signature value="{new_signature}"/>\n</Bank>'
-                    new_content = content.replace('</Bank>', signature_tag)
+                    newline = '\r\n' if '\r\n' in content else '\n'
+                    signature_tag = f'    <Signature value="{new_signature}"/>{newline}</Bank>'
+                    return content.replace('</Bank>', signature_tag)
                 else:
-                    return False
+                    return None
+        except Exception:
+            return None
+
+
+class ScanWorker(QThread):
+    """后台扫描账号线程"""
+    account_found = pyqtSignal(Account)  # type: ignore
+    finished = pyqtSignal(bool, str)  # type: ignore
+    
+    def run(self) -> None:
+        try:
+            documents = Path(os.path.expandvars("%USERPROFILE%")) / "Documents"
+            sc2_path = documents / "StarCraft II"
+            
+            if not sc2_path.exists():
+                self.finished.emit(False, f"未找到星际争霸 II 文档文件夹:\n{sc2_path}")
+                return
             
-            with open(bank_file_path, 'w', encoding='utf-8') as f:
-                _ = f.write(new_content)
+            accounts_path = sc2_path / "Accounts"
             
-            return True
-        except Exception:
-            return False
+            if not accounts_path.exists():
+                self.finished.emit(False, f"未找到 Accounts 文件夹:\n{accounts_path}")
+                return
+            
+            # 遍历所有账号
+            with os.scandir(accounts_path) as battle_net_entries:
+                for battle_net_entry in battle_net_entries:
+                    # 窗口关闭时停止扫描
+                    if self.isInterruptionRequested():
+                        return
+                    
+                    if not battle_net_entry.is_dir(follow_symlinks=False):
+                        continue
+                    
+                    battle_net_id = battle_net_entry.name
+                    
+                    with os.scandir(battle_net_entry.path) as handle_entries:
+                        for handle_entry in handle_entries:
+                            if self.isInterruptionRequested():
+                                return
+                            
+                            if not handle_entry.is_dir(follow_symlinks=False):
+                                continue
+                            
+                            handle = handle_entry.name
+                            
+                            if handle.startswith(_CN_HANDLE_PREFIX):
+                                account = Account(Path(handle_entry.path), battle_net_id, handle)
+                                if account.get_migratable_files():
+                                    self.account_found.emit(account)
+            
+            self.finished.emit(True, "")
+        
+        except Exception as e:
+            self.finished.emit(False, f"扫描账号时出错:\n{str(e)}")
 
 
 class MainWindow(QMainWindow):
@@ -167,6 +479,7 @@ class MainWindow(QMainWindow):
         self.bank_list: QListWidget
         self.migrate_btn: QPushButton
         self.worker: MigrationWorker | None = None
+        self.scan_worker: ScanWorker | None = None
         self.init_ui()
         self.scan_accounts()
     
@@ -196,6 +509,8 @@ class MainWindow(QMainWindow):
         
         self.account_list = QListWidget()
         self.account_list.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.account_list.setUniformItemSizes(True)
+        self.account_list.setLayoutMode(QListView.LayoutMode.Batched)
         _ = self.account_list.itemClicked.connect(self.on_account_selected)  # type: ignore
         account_layout.addWidget(self.account_list)
         
@@ -235,50 +550,33 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.migrate_btn)
     
     def scan_accounts(self) -> None:
-        """扫描账号"""
-        try:
-            documents = Path(os.path.expandvars("%USERPROFILE%")) / "Documents"
-            sc2_path = documents / "StarCraft II"
-            
-            if not sc2_path.exists():
-                _ = QMessageBox.critical(self, "错误", f"未找到星际争霸 II 文档文件夹:\n{sc2_path}")
-                return
-            
-            accounts_path = sc2_path / "Accounts"
-            
-            if not accounts_path.exists():
-                _ = QMessageBox.critical(self, "错误", f"未找到 Accounts 文件夹:\n{accounts_path}")
-                return
-            
-            # 遍历所有账号
-            for battle_net_id_folder in accounts_path.iterdir():
-                if not battle_net_id_folder.is_dir():
-                    continue
-                
-                battle_net_id = battle_net_id_folder.name
-                
-                for handle_folder in battle_net_id_folder.iterdir():
-                    if not handle_folder.is_dir():
-                        continue
-                    
-                    handle = handle_folder.name
-                    
-                    if handle.startswith("5-S2-1"):
-                        account = Account(handle_folder, battle_net_id, handle)
-                        if account.has_old_banks():
-                            self.accounts.append(account)
-            
-            # 显示账号列表
-            if not self.accounts:
-                _ = QMessageBox.information(self, "提示", "未找到需要迁移的账号。\n\n可能的原因:\n1. 所有账号的存档已经迁移完成\n2. 没有符合条件的国服账号\n3. 旧存档文件夹中没有需要迁移的存档文件")
-                return
-            
-            for account in self.accounts:
-                item = QListWidgetItem(f"句柄: {account.handle}\n战网 ID: {account.battle_net_id}")
-                self.account_list.addItem(item)
+        """在后台线程中扫描账号，扫描到的账号会逐个加入列表"""
+        self.scan_worker = ScanWorker()
+        _ = self.scan_worker.account_found.connect(self.on_account_found)  # type: ignore
+        _ = self.scan_worker.finished.connect(self.on_scan_finished)  # type: ignore
+        self.scan_worker.start()
+    
+    def on_account_found(self, account: Account) -> None:
+        """扫描到一个账号"""
+        self.accounts.append(account)
+        item = QListWidgetItem(f"句柄: {account.handle}\n战网 ID: {account.battle_net_id}")
+        self.account_list.addItem(item)
+    
+    def on_scan_finished(self, success: bool, message: str) -> None:
+        """扫描完成"""
+        if not success:
+            _ = QMessageBox.critical(self, "错误", message)
+            return
         
-        except Exception as e:
-            _ = QMessageBox.critical(self, "错误", f"扫描账号时出错:\n{str(e)}")
+        if not self.accounts:
+            _ = QMessageBox.information(self, "提示", "未找到需要迁移的账号。\n\n可能的原因:\n1. 所有账号的存档已经迁移完成\n2. 没有符合条件的国服账号\n3. 旧存档文件夹中没有需要迁移的存档文件")
+    
+    def closeEvent(self, event: QCloseEvent | None) -> None:
+        """关闭窗口前停止仍在运行的扫描线程"""
+        if self.scan_worker is not None and self.scan_worker.isRunning():
+            self.scan_worker.requestInterruption()
+            _ = self.scan_worker.wait()
+        super().closeEvent(event)
     
     def on_account_selected(self, item: QListWidgetItem) -> None:
         """账号被选中"""
@@ -288,59 +586,46 @@ class MainWindow(QMainWindow):
         # 清空并填充存档列表
         self.bank_list.clear()
         
-        migratable = self.selected_account.get_migratable_files()
-        existing = self.selected_account.get_existing_target_files()
+        migratable = frozenset(self.selected_account.get_migratable_files())
+        existing = frozenset(self.selected_account.get_existing_target_files())
         
-        for bank_file in migratable:
-            bank_name = BANK_NAMES.get(bank_file, bank_file)
+        for bank_file, bank_name in BANKS:
+            if bank_file not in migratable:
+                continue
             
-            # 创建复选框项
-            item_widget = QWidget()
-            item_layout = QHBoxLayout(item_widget)
-            item_layout.setContentsMargins(5, 2, 5, 2)
-            
-            checkbox = QCheckBox(f"{bank_name} ({bank_file})")
-            checkbox.setChecked(True)
-            _ = checkbox.setProperty("bank_file", bank_file)
-            item_layout.addWidget(checkbox)
-            
-            # 如果目标已存在，显示警告
+            # 创建可勾选的列表项，如果目标已存在，显示警告
+            list_item = QListWidgetItem(f"{bank_name} ({bank_file})")
+            list_item.setFlags(list_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            list_item.setCheckState(Qt.CheckState.Checked)
+            list_item.setData(Qt.ItemDataRole.UserRole, bank_file)
             if bank_file in existing:
-                warning = QLabel("⚠ 已有存档")
-                warning.setStyleSheet("color: orange; font-weight: bold;")
-                item_layout.addWidget(warning)
-            
-            item_layout.addStretch()
-            
-            list_item = QListWidgetItem(self.bank_list)
-            list_item.setSizeHint(item_widget.sizeHint())
+                self.mark_existing_bank(list_item)
             self.bank_list.addItem(list_item)
-            self.bank_list.setItemWidget(list_item, item_widget)
         
         self.bank_group.setEnabled(True)
         self.migrate_btn.setEnabled(True)
     
+    def mark_existing_bank(self, item: QListWidgetItem) -> None:
+        """为目标位置已有存档的列表项加上警告"""
+        if item.data(EXISTING_ROLE):
+            return
+        item.setText(item.text() + "  ⚠ 已有存档")
+        item.setForeground(QColor("orange"))
+        item.setData(EXISTING_ROLE, True)
+    
     def select_all_banks(self) -> None:
         """全选所有存档"""
         for i in range(self.bank_list.count()):
             item = self.bank_list.item(i)
             if item:
-                widget = self.bank_list.itemWidget(item)
-                if widget:
-                    checkbox = widget.findChild(QCheckBox)
-                    if checkbox:
-                        checkbox.setChecked(True)
+                item.setCheckState(Qt.CheckState.Checked)
     
     def deselect_all_banks(self) -> None:
         """取消全选"""
         for i in range(self.bank_list.count()):
             item = self.bank_list.item(i)
             if item:
-                widget = self.bank_list.itemWidget(item)
-                if widget:
-                    checkbox = widget.findChild(QCheckBox)
-                    if checkbox:
-                        checkbox.setChecked(False)
+                item.setCheckState(Qt.CheckState.Unchecked)
     
     def start_migration(self) -> None:
         """开始迁移"""
@@ -351,26 +636,23 @@ class MainWindow(QMainWindow):
         selected_files: list[str] = []
         for i in range(self.bank_list.count()):
             item = self.bank_list.item(i)
-            if item:
-                widget = self.bank_list.itemWidget(item)
-                if widget:
-                    checkbox = widget.findChild(QCheckBox)
-                    if checkbox and checkbox.isChecked():
-                        bank_file_prop = checkbox.property("bank_file")  # type: ignore
-                        if isinstance(bank_file_prop, str):
-                            selected_files.append(bank_file_prop)
+            if item and item.checkState() == Qt.CheckState.Checked:
+                bank_file_data = item.data(Qt.ItemDataRole.UserRole)  # type: ignore
+                if isinstance(bank_file_data, str):
+                    selected_files.append(bank_file_data)
         
         if not selected_files:
             _ = QMessageBox.warning(self, "提示", "请至少选择一个存档进行迁移")
             return
         
         # 确认对话框
-        existing = self.selected_account.get_existing_target_files()
+        existing = frozenset(self.selected_account.get_existing_target_files())
         existing_selected = [f for f in selected_files if f in existing]
         
         msg = f"即将迁移 {len(selected_files)} 个存档文件"
         if existing_selected:
-            msg += f"\n\n其中 {len(existing_selected)} 个文件在目标位置已存在，将创建备份后覆盖"
+            msg += (f"\n\n其中 {len(existing_selected)} 个文件在目标位置已存在，"
+                    "自上次迁移后未变化的将跳过，其余将创建备份后覆盖")
         msg += "\n\n确认开始迁移吗？"
         
         reply = QMessageBox.question(self, "确认迁移", msg, 
@@ -390,7 +672,7 @@ class MainWindow(QMainWindow):
             _ = self.worker.finished.connect(self.on_migration_finished)  # type: ignore
             self.worker.start()
     
-    def on_migration_finished(self, success: bool, message: str) -> None:
+    def on_migration_finished(self, success: bool, message: str, existing: frozenset[str]) -> None:
         """迁移完成"""
         # 恢复控件
         self.account_list.setEnabled(True)
@@ -399,10 +681,11 @@ class MainWindow(QMainWindow):
         
         if success:
             _ = QMessageBox.information(self, "迁移完成", message)
-            # 刷新存档列表以更新警告状态
-            current_item = self.account_list.currentItem()
-            if current_item:
-                self.on_account_selected(current_item)
+            # 只更新新出现 "已有存档" 状态的列表项，无需重建列表
+            for i in range(self.bank_list.count()):
+                item = self.bank_list.item(i)
+                if item and item.data(Qt.ItemDataRole.UserRole) in existing:
+                    self.mark_existing_bank(item)
         else:
             _ = QMessageBox.critical(self, "迁移失败", message)
 